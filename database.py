@@ -5,26 +5,280 @@ This module handles all database operations including creating tables,
 inserting, updating, deleting, and querying expense data.
 """
 
+import re
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
+from math import fsum
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Dict, NamedTuple, Optional, Set, Tuple
 from pathlib import Path
 
+try:
+    import apsw
+except ImportError:  # Optional: lower per-row overhead on the read path
+    apsw = None
+
+# Bound parameters per multi-row INSERT; stays well under SQLITE_MAX_VARIABLE_NUMBER
+# (999 on older SQLite builds)
+MAX_INSERT_PARAMS = 500
+ROWS_PER_INSERT = MAX_INSERT_PARAMS // 4
+
+# Stored in PRAGMA user_version; bump it when _init_database gains a migration
+SCHEMA_VERSION = 1
+
+# Indexes created by earlier versions, dropped once by the version 1 migration
+LEGACY_INDEXES = ("idx_expenses_date", "idx_expenses_category", "idx_expenses_cat_date")
+
+# SQL is kept in module constants so every call passes the same string and
+# hits the connection's prepared-statement cache
+INSERT_SQL = "INSERT INTO expenses (date, category, description, amount) VALUES (?, ?, ?, ?)"
+
+
+def _multi_insert_sql(rows: int) -> str:
+    """Build an INSERT statement with the given number of VALUES rows."""
+    return ("INSERT INTO expenses (date, category, description, amount) VALUES "
+            + ",".join(["(?, ?, ?, ?)"] * rows))
+
+
+BULK_INSERT_SQL = _multi_insert_sql(ROWS_PER_INSERT)
+
+# Paged expense listing, one statement per supported ordering; callers pick a
+# key rather than passing SQL
+SELECT_EXPENSES_SQL = {
+    order_by: f"""
+        SELECT id, date, category, description, amount, created_at
+        FROM expenses
+        ORDER BY {order_clause}
+        LIMIT ? OFFSET ?
+    """
+    for order_by, order_clause in (('date', 'date DESC, created_at DESC'), ('id', 'id DESC'))
+}
+
+# One UPDATE statement per non-empty combination of fields, keyed by a bitmask
+# with date as the highest bit: 0b1010 -> "SET date = ?, description = ?"
+UPDATE_FIELDS = ("date", "category", "description", "amount")
+UPDATE_SQL = {
+    mask: "UPDATE expenses SET "
+          + ", ".join(f"{field} = ?" for bit, field in enumerate(UPDATE_FIELDS)
+                      if mask & (0b1000 >> bit))
+          + " WHERE id = ?"
+    for mask in range(1, 1 << len(UPDATE_FIELDS))
+}
+
+
+class Expense(NamedTuple):
+    """One expense row; a tuple, so it is built straight from a cursor row."""
+    id: int
+    date: str
+    category: str
+    description: str
+    amount: float
+    created_at: str
+
+
+# Column order shared by every expense SELECT, the Expense fields and CSV export
+EXPENSE_COLUMNS = Expense._fields
+
+PERIODS = frozenset({'weekly', 'monthly', 'yearly'})
+
+_DATE_RE = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})")
+
+
+@lru_cache(maxsize=512)
+def _period_range(period: str, reference_date: Optional[str], today: int) -> Tuple[str, str]:
+    """
+    Compute the (start, end) range for ExpenseDatabase._get_period_range().
+    
+    period must already be one of PERIODS.
+    """
+    if reference_date is None:
+        ref = date.fromordinal(today)
+    else:
+        try:
+            ref = date.fromisoformat(reference_date)
+        except ValueError:
+            raise ValueError("Date must be in YYYY-MM-DD format")
+    
+    if period == 'weekly':
+        start = ref - timedelta(days=ref.weekday())
+        end = start + timedelta(days=6)
+    elif period == 'monthly':
+        start = ref.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        end = next_month - timedelta(days=1)
+    else:
+        start = ref.replace(month=1, day=1)
+        end = ref.replace(month=12, day=31)
+    
+    return start.isoformat(), end.isoformat()
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open an autocommit connection with the per-connection PRAGMAs applied."""
+    conn = sqlite3.connect(db_path, isolation_level=None,
+                           check_same_thread=False, cached_statements=256)
+    _configure(conn)
+    return conn
+
+
+def _connect_reader(db_path: str):
+    """
+    Open a read-only connection for the reader pool.
+    
+    Uses apsw when it is installed, since it hands rows back as tuples straight
+    from sqlite3_step without the stdlib module's per-call wrapping. Both
+    backends support cursor(), execute(), fetchone(), fetchall() and iteration,
+    which is all the query methods use.
+    """
+    if apsw is not None:
+        conn = apsw.Connection(db_path, statementcachesize=256)
+        _configure(conn)
+    else:
+        conn = _connect(db_path)
+    conn.cursor().execute("PRAGMA query_only=1")
+    return conn
+
+
+def _configure(conn) -> None:
+    """Apply the PRAGMAs that SQLite keeps per connection."""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA mmap_size=268435456")
+
+
+class _ReaderPool:
+    """Pool of read-only connections shared by the query methods."""
+    
+    def __init__(self, db_path: str, max_readers: int = 4):
+        """
+        Initialize an empty pool; connections are opened on demand.
+        
+        Args:
+            db_path: Path to the SQLite database file
+            max_readers: Maximum number of connections to open
+        """
+        self.db_path = db_path
+        self.max_readers = max(1, max_readers)
+        self._idle = queue.Queue()
+        self._connections = []
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Take an idle connection, opening a new one or waiting if the pool is full."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if len(self._connections) < self.max_readers:
+                conn = _connect_reader(self.db_path)
+                self._connections.append(conn)
+                return conn
+        
+        return self._idle.get()
+    
+    def release(self, conn) -> None:
+        """Return a connection to the pool."""
+        self._idle.put(conn)
+    
+    def close(self) -> None:
+        """Close every connection opened by the pool."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
 
 class ExpenseDatabase:
     """Handles all database operations for the expense tracker."""
     
-    def __init__(self, db_path: str = "data/expenses.db"):
+    # Database files whose directory and schema were already set up by this process
+    _initialized: Set[str] = set()
+    
+    def __init__(self, db_path: str = "data/expenses.db", max_readers: int = 4):
         """
         Initialize the database connection.
         
+        Writes go through a single dedicated connection; reads borrow one of up
+        to max_readers read-only connections so threads can query in parallel.
+        
         Args:
             db_path: Path to the SQLite database file
+            max_readers: Maximum number of pooled read-only connections
         """
         self.db_path = db_path
-        self._ensure_data_directory()
-        self._init_database()
+        self._lock = threading.Lock()
+        # Aggregates cached between writes; _rev is bumped on every write made
+        # here and _agg_rev is the revision the cached entries belong to
+        self._agg_cache = {}
+        self._agg_rev = None
+        self._rev = 0
+        # Skip the mkdir and schema statements for files already set up by
+        # another instance; an in-memory database always needs them
+        init_key = os.path.abspath(self.db_path) if self.db_path != ":memory:" else None
+        needs_init = init_key is None or init_key not in self._initialized
+        
+        if needs_init:
+            self._ensure_data_directory()
+        # Autocommit mode: single statements commit on their own and
+        # multi-statement writes are wrapped in explicit BEGIN/COMMIT
+        self._writer = _connect(self.db_path)
+        if needs_init:
+            self._init_database()
+            if init_key is not None:
+                self._initialized.add(init_key)
+        
+        # An in-memory database is private to its connection, so readers
+        # have to share the writer
+        if self.db_path == ":memory:":
+            self._readers = None
+        else:
+            self._readers = _ReaderPool(self.db_path, max_readers)
+    
+    def close(self) -> None:
+        """Close the writer connection and all pooled reader connections."""
+        readers = getattr(self, "_readers", None)
+        if readers is not None:
+            readers.close()
+            self._readers = None
+        
+        writer = getattr(self, "_writer", None)
+        if writer is not None:
+            writer.close()
+            self._writer = None
+    
+    def __del__(self):
+        """Close the connection when the instance is garbage collected."""
+        self.close()
+    
+    @contextmanager
+    def reader(self) -> Iterator:
+        """
+        Borrow a read-only connection for the duration of a with block.
+        
+        Under WAL, readers see a consistent snapshot without blocking the writer.
+        The connection is an apsw.Connection when apsw is installed and a
+        sqlite3.Connection otherwise. Results must be fully fetched before the
+        block exits.
+        """
+        if self._readers is None:
+            with self._lock:
+                yield self._writer
+            return
+        
+        conn = self._readers.acquire()
+        try:
+            yield conn
+        finally:
+            self._readers.release(conn)
     
     def _ensure_data_directory(self) -> None:
         """Create data directory if it doesn't exist."""
@@ -33,9 +287,17 @@ class ExpenseDatabase:
     
     def _init_database(self) -> None:
         """Initialize database and create tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self._writer
             cursor = conn.cursor()
             
+            # WAL lets readers run alongside the writer and, with the
+            # synchronous=NORMAL set in _connect(), avoids an fsync per commit.
+            # Unlike the other PRAGMAs it is stored in the database file.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
+            cursor.execute("BEGIN")
+            
             # Create expenses table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS expenses (
@@ -48,7 +310,24 @@ class ExpenseDatabase:
                 )
             """)
             
-            conn.commit()
+            # Indexes for the date range and per-category queries. Carrying
+            # amount makes them covering for the SUM(amount) aggregates, which
+            # then never touch the table itself
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_expenses_date_amount ON expenses(date, amount)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_expenses_category_amount ON expenses(category, amount)"
+            )
+            
+            # One-time migration for files created before user_version was set
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < SCHEMA_VERSION:
+                for index in LEGACY_INDEXES:
+                    cursor.execute(f"DROP INDEX IF EXISTS {index}")
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            
+            cursor.execute("COMMIT")
     
     def add_expense(self, date: str, category: str, description: str, amount: float) -> int:
         """
@@ -66,51 +345,185 @@ class ExpenseDatabase:
         Raises:
             ValueError: If amount is negative or invalid date format
         """
-        if amount < 0:
+        self._validate_expense(date, amount)
+        
+        with self._lock:
+            conn = self._writer
+            cursor = conn.cursor()
+            cursor.execute(INSERT_SQL, (date, category, description, amount))
+            
+            expense_id = cursor.lastrowid
+            self._invalidate_cache()
+            
+        return expense_id
+    
+    def add_expenses_bulk(self, rows: List[Tuple[str, str, str, float]]) -> int:
+        """
+        Add many expenses in a single transaction.
+        
+        Rows are written with multi-row INSERT statements, each carrying up to
+        MAX_INSERT_PARAMS bound parameters.
+        
+        Args:
+            rows: (date, category, description, amount) tuples
+            
+        Returns:
+            Number of expenses inserted
+            
+        Raises:
+            ValueError: If any row has a negative amount or invalid date format
+        """
+        for day, _, _, amount in rows:
+            self._validate_expense(day, amount)
+        
+        with self._lock:
+            conn = self._writer
+            conn.execute("BEGIN")
+            try:
+                for start in range(0, len(rows), ROWS_PER_INSERT):
+                    chunk = rows[start:start + ROWS_PER_INSERT]
+                    if len(chunk) == ROWS_PER_INSERT:
+                        sql = BULK_INSERT_SQL
+                    else:
+                        sql = _multi_insert_sql(len(chunk))
+                    conn.execute(sql, list(chain.from_iterable(chunk)))
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._invalidate_cache()
+        
+        return len(rows)
+    
+    @staticmethod
+    def _validate_expense(date: Optional[str], amount: Optional[float]) -> None:
+        """
+        Validate the amount and date of an expense, skipping values that are None.
+        
+        Raises:
+            ValueError: If amount is negative or invalid date format
+        """
+        if amount is not None and amount < 0:
             raise ValueError("Amount cannot be negative")
         
-        # Validate date format
+        if date is None:
+            return
+        
+        # Validate date format; the datetime constructor rejects impossible
+        # days such as 2024-02-30 without going through strptime
+        match = _DATE_RE.fullmatch(date)
+        if not match:
+            raise ValueError("Date must be in YYYY-MM-DD format")
         try:
-            datetime.strptime(date, "%Y-%m-%d")
+            datetime(*map(int, match.groups()))
         except ValueError:
             raise ValueError("Date must be in YYYY-MM-DD format")
+    
+    def get_all_expenses(self, limit: Optional[int] = None) -> List[Expense]:
+        """
+        Retrieve all expenses from the database, newest first.
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO expenses (date, category, description, amount)
-                VALUES (?, ?, ?, ?)
-            """, (date, category, description, amount))
+        Args:
+            limit: Maximum number of expenses to return (None for all)
             
-            expense_id = cursor.lastrowid
-            conn.commit()
+        Returns:
+            List of Expense rows
+        """
+        return self.get_expenses(limit)
+    
+    def get_expenses(self, limit: Optional[int] = None, offset: int = 0,
+                     order_by: str = 'date') -> List[Expense]:
+        """
+        Retrieve a page of expenses, letting SQLite apply the ordering and limit.
+        
+        Args:
+            limit: Maximum number of expenses to return (None for all)
+            offset: Number of expenses to skip
+            order_by: 'date' (newest date first) or 'id' (most recently added first)
             
-        return expense_id
+        Returns:
+            List of Expense rows
+            
+        Raises:
+            ValueError: If order_by is not a supported ordering
+        """
+        return list(map(Expense._make, self.get_expense_rows(limit, offset, order_by)))
     
-    def get_all_expenses(self) -> List[Dict]:
+    def get_expense_rows(self, limit: Optional[int] = None, offset: int = 0,
+                         order_by: str = 'date') -> List[Tuple]:
         """
-        Retrieve all expenses from the database.
+        Retrieve a page of expenses as plain row tuples.
+        
+        Skips even the Expense wrapper, for callers that only unpack rows.
+        Tuples hold the fields in EXPENSE_COLUMNS order.
         
+        Args:
+            limit: Maximum number of expenses to return (None for all)
+            offset: Number of expenses to skip
+            order_by: 'date' (newest date first) or 'id' (most recently added first)
+            
         Returns:
-            List of dictionaries containing expense data
+            List of (id, date, category, description, amount, created_at) tuples
+            
+        Raises:
+            ValueError: If order_by is not a supported ordering
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        try:
+            sql = SELECT_EXPENSES_SQL[order_by]
+        except KeyError:
+            raise ValueError(f"order_by must be one of: {', '.join(SELECT_EXPENSES_SQL)}")
+        
+        with self.reader() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id, date, category, description, amount, created_at
-                FROM expenses
-                ORDER BY date DESC, created_at DESC
-            """)
+            # LIMIT -1 means no limit, so one statement serves both cases
+            cursor.execute(sql, (-1 if limit is None else limit, offset))
             
-            expenses = []
-            for row in cursor.fetchall():
-                expenses.append(dict(row))
+            return cursor.fetchall()
+    
+    def stream_expenses(self) -> Iterator[Tuple]:
+        """
+        Yield every expense as a plain row tuple, newest date first.
+        
+        On a database file, rows come straight off a pooled reader's cursor
+        without being collected into a list, so memory stays flat however
+        large the table is. That reader is held until the generator is
+        exhausted or closed, so wrap partial consumers in contextlib.closing.
+        
+        An in-memory database is only reachable through the writer under the
+        write lock, so its rows are fetched up front and the lock is released
+        before the first row is yielded.
+        
+        Yields:
+            (id, date, category, description, amount, created_at) tuples
+        """
+        if self._readers is None:
+            with self.reader() as conn:
+                cursor = conn.cursor()
+                cursor.execute(SELECT_EXPENSES_SQL['date'], (-1, 0))
+                rows = cursor.fetchall()
+            yield from rows
+            return
+        
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(SELECT_EXPENSES_SQL['date'], (-1, 0))
+            yield from cursor
+    
+    def get_recent_expenses(self, limit: int = 10) -> List[Expense]:
+        """
+        Retrieve only the most recent expenses, newest date first.
+        
+        Args:
+            limit: Number of expenses to return
             
-            return expenses
+        Returns:
+            List of Expense rows
+        """
+        return self.get_expenses(limit)
     
-    def get_expense_by_id(self, expense_id: int) -> Optional[Dict]:
+    def get_expense_by_id(self, expense_id: int) -> Optional[Expense]:
         """
         Retrieve a specific expense by ID.
         
@@ -118,10 +531,9 @@ class ExpenseDatabase:
             expense_id: ID of the expense to retrieve
             
         Returns:
-            Dictionary containing expense data or None if not found
+            Expense row or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.reader() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -131,7 +543,7 @@ class ExpenseDatabase:
             """, (expense_id,))
             
             row = cursor.fetchone()
-            return dict(row) if row else None
+            return Expense._make(row) if row else None
     
     def delete_expense(self, expense_id: int) -> bool:
         """
@@ -143,33 +555,83 @@ class ExpenseDatabase:
         Returns:
             True if expense was deleted, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._lock:
+            conn = self._writer
             cursor = conn.cursor()
             
             cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
             deleted_rows = cursor.rowcount
-            
-            conn.commit()
+            if deleted_rows:
+                self._invalidate_cache()
             
             return deleted_rows > 0
     
-    def get_expenses_by_category(self) -> Dict[str, List[Dict]]:
+    def update_expense(self, expense_id: int, date: Optional[str] = None,
+                       category: Optional[str] = None, description: Optional[str] = None,
+                       amount: Optional[float] = None) -> bool:
         """
-        Get all expenses grouped by category.
+        Update one or more fields of an existing expense.
         
+        Args:
+            expense_id: ID of the expense to update
+            date: New date (YYYY-MM-DD format)
+            category: New category
+            description: New description
+            amount: New amount
+            
         Returns:
-            Dictionary with categories as keys and lists of expenses as values
+            True if expense was updated, False if not found
+            
+        Raises:
+            ValueError: If no field is given, amount is negative or invalid date format
         """
-        expenses = self.get_all_expenses()
-        categorized = {}
+        values = (date, category, description, amount)
+        mask = 0
+        params = []
+        for bit, value in enumerate(values):
+            if value is not None:
+                mask |= 0b1000 >> bit
+                params.append(value)
         
-        for expense in expenses:
-            category = expense['category']
-            if category not in categorized:
-                categorized[category] = []
-            categorized[category].append(expense)
+        if not mask:
+            raise ValueError("At least one field must be given to update")
+        self._validate_expense(date, amount)
         
-        return categorized
+        params.append(expense_id)
+        
+        with self._lock:
+            conn = self._writer
+            cursor = conn.cursor()
+            
+            cursor.execute(UPDATE_SQL[mask], params)
+            updated_rows = cursor.rowcount
+            if updated_rows:
+                self._invalidate_cache()
+            
+            return updated_rows > 0
+    
+    def get_expenses_by_category(self) -> Dict[str, List[Expense]]:
+        """
+        Get all expenses grouped by category.
+        
+        Returns:
+            Dictionary with categories as keys and lists of Expense rows as values
+        """
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT id, date, category, description, amount, created_at
+                FROM expenses
+                ORDER BY date DESC, created_at DESC
+            """)
+            
+            # Stream rows straight from the cursor into their category lists
+            categorized = {}
+            for row in cursor:
+                categorized.setdefault(row[2], []).append(Expense._make(row))
+            
+            return categorized
     
     def get_category_totals(self) -> Dict[str, float]:
         """
@@ -178,17 +640,24 @@ class ExpenseDatabase:
         Returns:
             Dictionary with categories as keys and total amounts as values
         """
-        with sqlite3.connect(self.db_path) as conn:
+        rev, cached = self._cached_aggregate('category_totals')
+        if cached is not None:
+            return cached
+        
+        with self.reader() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT category, SUM(amount) as total
+                SELECT category, COALESCE(SUM(amount), 0.0) as total
                 FROM expenses
                 GROUP BY category
                 ORDER BY total DESC
             """)
             
-            return dict(cursor.fetchall())
+            # Build the dict straight from the cursor, no intermediate list
+            totals = dict(cursor)
+        
+        return self._store_aggregate('category_totals', rev, totals)
     
     def get_monthly_totals(self) -> Dict[str, float]:
         """
@@ -197,19 +666,68 @@ class ExpenseDatabase:
         Returns:
             Dictionary with months (YYYY-MM) as keys and total amounts as values
         """
-        with sqlite3.connect(self.db_path) as conn:
+        rev, cached = self._cached_aggregate('monthly_totals')
+        if cached is not None:
+            return cached
+        
+        with self.reader() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT strftime('%Y-%m', date) as month, SUM(amount) as total
+                SELECT substr(date, 1, 7) as month, COALESCE(SUM(amount), 0.0) as total
                 FROM expenses
-                GROUP BY month
+                GROUP BY substr(date, 1, 7)
                 ORDER BY month DESC
             """)
             
-            return dict(cursor.fetchall())
+            totals = dict(cursor)
+        
+        return self._store_aggregate('monthly_totals', rev, totals)
+    
+    @property
+    def revision(self) -> Tuple[int, int]:
+        """
+        Token that changes on every write; cached results are valid while it is unchanged.
+        
+        Pairs the counter of writes made through this instance with SQLite's
+        data_version for the writer connection, which changes whenever any
+        other connection, in this process or another, commits to the file.
+        """
+        with self._lock:
+            data_version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            return self._rev, data_version
+    
+    def _cached_aggregate(self, key: str) -> Tuple[Tuple[int, int], Optional[Dict]]:
+        """
+        Look up a cached aggregate, dropping the cache if the database changed.
+        
+        Returns:
+            Tuple of (current revision, copy of the cached value or None)
+        """
+        rev = self.revision
+        if rev != self._agg_rev:
+            self._agg_cache.clear()
+            self._agg_rev = rev
+        
+        cached = self._agg_cache.get(key)
+        return rev, None if cached is None else dict(cached)
     
-    def get_expenses_by_month(self, year: int, month: int) -> List[Dict]:
+    def _store_aggregate(self, key: str, rev: Tuple[int, int], totals: Dict) -> Dict:
+        """
+        Cache an aggregate computed at revision rev and return a copy of it.
+        
+        The result is only cached if no write happened while it was computed.
+        """
+        if rev == self.revision:
+            self._agg_cache[key] = totals
+        return dict(totals)
+    
+    def _invalidate_cache(self) -> None:
+        """Drop cached aggregates after a write; call while holding the write lock."""
+        self._rev += 1
+        self._agg_cache.clear()
+    
+    def get_expenses_by_month(self, year: int, month: int) -> List[Expense]:
         """
         Get all expenses for a specific month.
         
@@ -220,22 +738,109 @@ class ExpenseDatabase:
         Returns:
             List of expenses for the specified month
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        # Dates are stored as YYYY-MM-DD, so a plain string range selects the
+        # month and can use idx_expenses_date_amount
+        start = f"{year:04d}-{month:02d}-01"
+        if month == 12:
+            end = f"{year + 1:04d}-01-01"
+        else:
+            end = f"{year:04d}-{month + 1:02d}-01"
+        
+        with self.reader() as conn:
             cursor = conn.cursor()
             
             cursor.execute("""
                 SELECT id, date, category, description, amount, created_at
                 FROM expenses
-                WHERE strftime('%Y', date) = ? AND strftime('%m', date) = ?
+                WHERE date >= ? AND date < ?
                 ORDER BY date DESC
-            """, (str(year), f"{month:02d}"))
+            """, (start, end))
+            
+            return list(map(Expense._make, cursor.fetchall()))
+    
+    def get_daily_totals_between(self, start_date: str, end_date: str) -> Dict[str, float]:
+        """
+        Get total amount spent per day in a date range.
+        
+        Args:
+            start_date: First date to include (YYYY-MM-DD)
+            end_date: First date to exclude (YYYY-MM-DD)
+            
+        Returns:
+            Dictionary with dates as keys and total amounts as values, oldest first
+        """
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            # Compares the raw column so the range can use idx_expenses_date_amount
+            cursor.execute("""
+                SELECT date, SUM(amount) as total
+                FROM expenses
+                WHERE date >= ? AND date < ?
+                GROUP BY date
+                ORDER BY date
+            """, (start_date, end_date))
+            
+            return dict(cursor)
+    
+    def get_period_summary(self, period: str,
+                           reference_date: Optional[str] = None) -> Tuple[float, Dict[str, float]]:
+        """
+        Get the total spent and the per-category breakdown for a period.
+        
+        Both figures come from a single grouped query over the period's date range.
+        
+        Args:
+            period: 'weekly', 'monthly' or 'yearly'
+            reference_date: Date inside the period (YYYY-MM-DD), defaults to today
+            
+        Returns:
+            Tuple of (total amount, dictionary of category totals)
+            
+        Raises:
+            ValueError: If period is unknown or reference_date is invalid
+        """
+        start, end = self._get_period_range(period, reference_date)
+        
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT category, COALESCE(SUM(amount), 0.0) as total
+                FROM expenses
+                WHERE date BETWEEN ? AND ?
+                GROUP BY category
+                ORDER BY total DESC
+            """, (start, end))
             
-            expenses = []
-            for row in cursor.fetchall():
-                expenses.append(dict(row))
+            by_category = dict(cursor)
+            return fsum(by_category.values()), by_category
+    
+    @staticmethod
+    def _get_period_range(period: str, reference_date: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Get the first and last day (inclusive) of the period containing a date.
+        
+        Args:
+            period: 'weekly', 'monthly' or 'yearly'
+            reference_date: Date inside the period (YYYY-MM-DD), defaults to today
             
-            return expenses
+        Returns:
+            Tuple of (start, end) dates in YYYY-MM-DD format
+            
+        Raises:
+            ValueError: If period is unknown or reference_date is invalid
+        """
+        # Only lowercase when needed; the common already-canonical case is a
+        # single set lookup
+        if period not in PERIODS:
+            period = period.lower()
+            if period not in PERIODS:
+                raise ValueError("Period must be 'weekly', 'monthly' or 'yearly'")
+        
+        # Key "today" by its ordinal so repeated calls on the same day hit the cache
+        today = date.today().toordinal() if reference_date is None else 0
+        return _period_range(period, reference_date, today)
     
     def add_sample_data(self) -> None:
         """Add sample data for demonstration purposes."""
@@ -252,11 +857,10 @@ class ExpenseDatabase:
             ("2024-01-24", "Food", "Dinner out", 35.75),
         ]
         
-        for date, category, description, amount in sample_expenses:
-            try:
-                self.add_expense(date, category, description, amount)
-            except Exception as e:
-                print(f"Error adding sample expense: {e}")
+        try:
+            self.add_expenses_bulk(sample_expenses)
+        except Exception as e:
+            print(f"Error adding sample expenses: {e}")
     
     def get_database_stats(self) -> Dict[str, int]:
         """
@@ -265,29 +869,53 @@ class ExpenseDatabase:
         Returns:
             Dictionary with database statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        rev, cached = self._cached_aggregate('database_stats')
+        if cached is not None:
+            return cached
+        
+        with self.reader() as conn:
             cursor = conn.cursor()
             
-            # Total expenses
-            cursor.execute("SELECT COUNT(*) FROM expenses")
-            total_expenses = cursor.fetchone()[0]
-            
-            # Total amount
-            cursor.execute("SELECT SUM(amount) FROM expenses")
-            total_amount = cursor.fetchone()[0] or 0
-            
-            # Number of categories
-            cursor.execute("SELECT COUNT(DISTINCT category) FROM expenses")
-            total_categories = cursor.fetchone()[0]
+            # Count, total amount and number of categories in a single scan
+            cursor.execute("""
+                SELECT COUNT(*), COALESCE(SUM(amount), 0), COUNT(DISTINCT category)
+                FROM expenses
+            """)
+            total_expenses, total_amount, total_categories = cursor.fetchone()
+        
+        return self._store_aggregate('database_stats', rev, {
+            'total_expenses': total_expenses,
+            'total_amount': total_amount,
+            'total_categories': total_categories
+        })
+    
+    def get_report_bundle(self, recent_limit: int = 10) -> Dict:
+        """
+        Get the totals and recent rows the detailed report needs.
+        
+        The totals come from the cached get_database_stats(), so a report right
+        after another stats call costs only the recent-expense query. If a write
+        lands in between, both parts are re-read (up to three attempts) so they
+        stay consistent.
+        
+        Args:
+            recent_limit: Number of most recent expenses to include
             
-            return {
-                'total_expenses': total_expenses,
-                'total_amount': total_amount,
-                'total_categories': total_categories
-            }
+        Returns:
+            Dictionary with total_expenses, total_amount, total_categories
+            and recent_expenses
+        """
+        # Bounded so steady writes from other threads cannot stall the report;
+        # the last attempt is returned even if a write landed during it
+        for _ in range(3):
+            rev = self.revision
+            bundle = self.get_database_stats()
+            bundle['recent_expenses'] = self.get_recent_expenses(recent_limit)
+            if rev == self.revision:
+                break
+        return bundle
 
 
-# TODO: Add option to export expenses to Excel or CSV
+# TODO: Add option to export expenses to Excel
 # TODO: Add Google Sheets integration for syncing
 # TODO: Fix occasional bug: program crashes if invalid category is entered
-# TODO: Add tests for database.py using pytest
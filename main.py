@@ -6,27 +6,156 @@ This is the main entry point for the Personal Expense Tracker application.
 It provides a command-line interface for managing personal expenses.
 """
 
+import argparse
+import io
+import math
+import re
 import sys
 import os
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Optional, List
-import argparse
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import ExpenseDatabase
+from database import ExpenseDatabase, PERIODS
 from reports import ExpenseReports
 
+EQ40 = "=" * 40
+EQ50 = "=" * 50
+EQ80 = "=" * 80
+DASH80 = "-" * 80
+
+# Plain decimal amounts such as "12", "12.50" or ".5"; anything else is rejected
+# before float() so bad input never goes through exception handling
+_AMOUNT_RE = re.compile(r"-?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)")
+
+
+def _parse_positive_amount(text: str) -> Optional[float]:
+    """
+    Parse a user-entered amount, printing an error if it is not usable.
+    
+    Args:
+        text: Raw input text
+        
+    Returns:
+        The amount as a float, or None if it is not a positive number
+    """
+    text = text.strip()
+    if not _AMOUNT_RE.fullmatch(text):
+        print("Error: Invalid amount. Please enter a valid number.")
+        return None
+    
+    amount = float(text)
+    # A long enough digit string still overflows to inf
+    if not math.isfinite(amount):
+        print("Error: Invalid amount. Please enter a valid number.")
+        return None
+    if amount <= 0:
+        print("Error: Amount must be positive.")
+        return None
+    return amount
+
+
+@lru_cache(maxsize=1)
+def _iso_date(ordinal: int) -> str:
+    """Format a proleptic Gregorian ordinal as YYYY-MM-DD."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+def _today_iso() -> str:
+    """Today's date as YYYY-MM-DD, formatted once per day."""
+    # Keyed by the ordinal, so the cached string rolls over at midnight
+    return _iso_date(date.today().toordinal())
+
+
+def _required_text(text: str, label: str) -> Optional[str]:
+    """
+    Strip a text field, printing an error if nothing is left.
+    
+    Args:
+        text: Raw input text
+        label: Field name for the error message, e.g. "Category"
+        
+    Returns:
+        The stripped text, or None if it is empty
+    """
+    text = text.strip()
+    if not text:
+        print(f"Error: {label} cannot be empty.")
+        return None
+    return text
+
+
+def _positive_int(text: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return value
+
 
 class ExpenseTrackerCLI:
     """Command-line interface for the Personal Expense Tracker."""
     
-    def __init__(self):
-        """Initialize the CLI application."""
+    # Menus are built once; each choice maps to the name of a handler method
+    # (on the CLI for the main menu, on ExpenseReports for the chart menu)
+    MAIN_MENU = "\n".join([
+        "\nMain Menu:",
+        "1. Add Expense",
+        "2. List Expenses",
+        "3. Delete Expense",
+        "4. Show Summaries",
+        "5. Show Charts",
+        "6. Detailed Report",
+        "7. Statistics",
+        "8. Export to CSV",
+        "0. Exit",
+    ])
+    MAIN_HANDLERS = {
+        '1': 'add_expense',
+        '2': '_prompt_list_expenses',
+        '3': 'delete_expense',
+        '4': 'show_summaries',
+        '5': 'show_charts',
+        '6': 'show_detailed_report',
+        '7': 'show_stats',
+        '8': 'export_csv',
+    }
+    
+    CHART_MENU = "\n".join([
+        "\nChart Options:",
+        "1. Category Bar Chart",
+        "2. Monthly Bar Chart",
+        "3. Category Pie Chart",
+        "4. Daily Trend Chart (Last 30 days)",
+        "5. All Charts",
+        "0. Back to main menu",
+    ])
+    CHART_HANDLERS = {
+        '1': 'generate_category_chart',
+        '2': 'generate_monthly_chart',
+        '3': 'generate_pie_chart',
+        '4': 'generate_trend_chart',
+        '5': 'generate_all_charts',
+    }
+    
+    def __init__(self, seed_sample_data: bool = True):
+        """
+        Initialize the CLI application.
+        
+        Args:
+            seed_sample_data: Add sample expenses when the database is empty
+                (off for scripted subcommands)
+        """
         self.db = ExpenseDatabase()
         self.reports = ExpenseReports(self.db)
-        self._check_first_run()
+        if seed_sample_data:
+            self._check_first_run()
     
     def _check_first_run(self) -> None:
         """Check if this is the first run and add sample data if needed."""
@@ -41,15 +170,15 @@ class ExpenseTrackerCLI:
     
     def add_expense(self) -> None:
         """Add a new expense interactively."""
-        print("\n" + "="*40)
+        print("\n" + EQ40)
         print("ADD NEW EXPENSE")
-        print("="*40)
+        print(EQ40)
         
         try:
             # Get date
             date_input = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
             if not date_input:
-                expense_date = date.today().strftime("%Y-%m-%d")
+                expense_date = _today_iso()
             else:
                 expense_date = date_input
             
@@ -67,14 +196,8 @@ class ExpenseTrackerCLI:
                 return
             
             # Get amount
-            amount_input = input("Enter amount: $").strip()
-            try:
-                amount = float(amount_input)
-                if amount <= 0:
-                    print("Error: Amount must be positive.")
-                    return
-            except ValueError:
-                print("Error: Invalid amount. Please enter a valid number.")
+            amount = _parse_positive_amount(input("Enter amount: $"))
+            if amount is None:
                 return
             
             # Add expense to database
@@ -92,41 +215,51 @@ class ExpenseTrackerCLI:
         except Exception as e:
             print(f"Unexpected error: {e}")
     
+    def _prompt_list_expenses(self) -> None:
+        """Ask how many expenses to show, then list them."""
+        limit_input = input("Enter number of expenses to show (or press Enter for all): ").strip()
+        limit = int(limit_input) if limit_input.isdigit() else None
+        self.list_expenses(limit)
+    
     def list_expenses(self, limit: Optional[int] = None) -> None:
         """List all expenses or a limited number."""
-        print("\n" + "="*80)
+        print("\n" + EQ80)
         print("EXPENSE LIST")
-        print("="*80)
+        print(EQ80)
         
-        expenses = self.db.get_all_expenses()
+        # Let SQLite apply the limit, and take plain tuples since the rows
+        # are only printed
+        expenses = self.db.get_expense_rows(limit=limit or None)
         
         if not expenses:
             print("No expenses found.")
             return
         
+        buf = io.StringIO()
         if limit:
-            expenses = expenses[:limit]
-            print(f"Showing last {len(expenses)} expenses:")
+            print(f"Showing last {len(expenses)} expenses:", file=buf)
         else:
-            print(f"Showing all {len(expenses)} expenses:")
+            print(f"Showing all {len(expenses)} expenses:", file=buf)
         
-        print("-"*80)
-        print(f"{'ID':<4} {'Date':<12} {'Category':<15} {'Description':<25} {'Amount':<10}")
-        print("-"*80)
+        print(DASH80, file=buf)
+        print(f"{'ID':<4} {'Date':<12} {'Category':<15} {'Description':<25} {'Amount':<10}", file=buf)
+        print(DASH80, file=buf)
         
-        for expense in expenses:
-            description = expense['description'][:24] if len(expense['description']) > 24 else expense['description']
-            print(f"{expense['id']:<4} {expense['date']:<12} {expense['category']:<15} "
-                  f"{description:<25} ${expense['amount']:<9.2f}")
+        for expense_id, day, category, description, amount, _ in expenses:
+            print(f"{expense_id:<4} {day:<12} {category:<15} "
+                  f"{description[:24]:<25} ${amount:<9.2f}", file=buf)
         
-        print("-"*80)
-        print(f"Total: {len(expenses)} expenses")
+        print(DASH80, file=buf)
+        print(f"Total: {len(expenses)} expenses", file=buf)
+        
+        # One write for the whole table instead of a print() per row
+        sys.stdout.write(buf.getvalue())
     
     def delete_expense(self) -> None:
         """Delete an expense by ID."""
-        print("\n" + "="*40)
+        print("\n" + EQ40)
         print("DELETE EXPENSE")
-        print("="*40)
+        print(EQ40)
         
         try:
             expense_id_input = input("Enter expense ID to delete: ").strip()
@@ -140,11 +273,11 @@ class ExpenseTrackerCLI:
             
             # Show expense details
             print(f"\nExpense to delete:")
-            print(f"  ID: {expense['id']}")
-            print(f"  Date: {expense['date']}")
-            print(f"  Category: {expense['category']}")
-            print(f"  Description: {expense['description']}")
-            print(f"  Amount: ${expense['amount']:.2f}")
+            print(f"  ID: {expense.id}")
+            print(f"  Date: {expense.date}")
+            print(f"  Category: {expense.category}")
+            print(f"  Description: {expense.description}")
+            print(f"  Amount: ${expense.amount:.2f}")
             
             # Confirm deletion
             confirm = input("\nAre you sure you want to delete this expense? (y/N): ").strip().lower()
@@ -163,9 +296,9 @@ class ExpenseTrackerCLI:
     
     def show_summaries(self) -> None:
         """Show category and monthly summaries."""
-        print("\n" + "="*50)
+        print("\n" + EQ50)
         print("EXPENSE SUMMARIES")
-        print("="*50)
+        print(EQ50)
         
         # Category summary
         self.reports.print_category_summary()
@@ -175,9 +308,9 @@ class ExpenseTrackerCLI:
     
     def show_charts(self) -> None:
         """Display various expense charts."""
-        print("\n" + "="*40)
+        print("\n" + EQ40)
         print("EXPENSE CHARTS")
-        print("="*40)
+        print(EQ40)
         
         stats = self.db.get_database_stats()
         if stats['total_expenses'] == 0:
@@ -185,103 +318,233 @@ class ExpenseTrackerCLI:
             return
         
         while True:
-            print("\nChart Options:")
-            print("1. Category Bar Chart")
-            print("2. Monthly Bar Chart")
-            print("3. Category Pie Chart")
-            print("4. Daily Trend Chart (Last 30 days)")
-            print("5. All Charts")
-            print("0. Back to main menu")
+            print(self.CHART_MENU)
             
             choice = input("\nSelect chart option (0-5): ").strip()
             
             if choice == '0':
                 break
-            elif choice == '1':
-                self.reports.generate_category_chart()
-            elif choice == '2':
-                self.reports.generate_monthly_chart()
-            elif choice == '3':
-                self.reports.generate_pie_chart()
-            elif choice == '4':
-                self.reports.generate_trend_chart()
-            elif choice == '5':
-                print("Generating all charts...")
-                self.reports.generate_category_chart()
-                self.reports.generate_monthly_chart()
-                self.reports.generate_pie_chart()
-                self.reports.generate_trend_chart()
+            
+            handler = self.CHART_HANDLERS.get(choice)
+            if handler is None:
+                self._invalid_option()
             else:
-                print("Invalid option. Please try again.")
+                getattr(self.reports, handler)()
+    
+    def _invalid_option(self) -> None:
+        """Report an unrecognised menu choice."""
+        print("Invalid option. Please try again.")
     
     def show_detailed_report(self) -> None:
         """Show a detailed expense report."""
         self.reports.print_detailed_report()
     
+    def export_csv(self) -> None:
+        """Export all expenses to a CSV file."""
+        path = input("Enter output file (or press Enter for exports/): ").strip()
+        try:
+            self.reports.export_to_csv(path or None)
+        except OSError as e:
+            print(f"Error: Could not write export: {e}")
+    
     def show_stats(self) -> None:
         """Show database statistics."""
         stats = self.db.get_database_stats()
         
-        print("\n" + "="*40)
-        print("DATABASE STATISTICS")
-        print("="*40)
-        print(f"Total Expenses: {stats['total_expenses']}")
-        print(f"Total Amount: ${stats['total_amount']:.2f}")
-        print(f"Categories: {stats['total_categories']}")
+        buf = io.StringIO()
+        print("\n" + EQ40, file=buf)
+        print("DATABASE STATISTICS", file=buf)
+        print(EQ40, file=buf)
+        print(f"Total Expenses: {stats['total_expenses']}", file=buf)
+        print(f"Total Amount: ${stats['total_amount']:.2f}", file=buf)
+        print(f"Categories: {stats['total_categories']}", file=buf)
         
         if stats['total_expenses'] > 0:
             avg_expense = stats['total_amount'] / stats['total_expenses']
-            print(f"Average per Expense: ${avg_expense:.2f}")
+            print(f"Average per Expense: ${avg_expense:.2f}", file=buf)
         
-        print("="*40)
+        print(EQ40, file=buf)
+        sys.stdout.write(buf.getvalue())
+    
+    def cmd_add(self, args: argparse.Namespace) -> int:
+        """Add an expense from command-line arguments."""
+        category = _required_text(args.category, "Category")
+        if category is None:
+            return 1
+        description = _required_text(args.description, "Description")
+        if description is None:
+            return 1
+        amount = _parse_positive_amount(args.amount)
+        if amount is None:
+            return 1
+        
+        expense_date = args.date or _today_iso()
+        try:
+            expense_id = self.db.add_expense(expense_date, category, description, amount)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        
+        print(f"Added expense {expense_id}: {expense_date} {category} "
+              f"{description} ${amount:.2f}")
+        return 0
+    
+    def cmd_list(self, args: argparse.Namespace) -> int:
+        """List expenses from command-line arguments."""
+        self.list_expenses(args.limit)
+        return 0
+    
+    def cmd_delete(self, args: argparse.Namespace) -> int:
+        """Delete expenses by ID without prompting for confirmation."""
+        status = 0
+        for expense_id in args.ids:
+            if self.db.delete_expense(expense_id):
+                print(f"Deleted expense {expense_id}")
+            else:
+                print(f"Error: Expense with ID {expense_id} not found.")
+                status = 1
+        return status
+    
+    def cmd_edit(self, args: argparse.Namespace) -> int:
+        """Update the given fields of an expense."""
+        category = description = None
+        if args.category is not None:
+            category = _required_text(args.category, "Category")
+            if category is None:
+                return 1
+        if args.description is not None:
+            description = _required_text(args.description, "Description")
+            if description is None:
+                return 1
+        
+        amount = None
+        if args.amount is not None:
+            amount = _parse_positive_amount(args.amount)
+            if amount is None:
+                return 1
+        
+        try:
+            updated = self.db.update_expense(args.id, date=args.date, category=category,
+                                             description=description, amount=amount)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        
+        if not updated:
+            print(f"Error: Expense with ID {args.id} not found.")
+            return 1
+        print(f"Updated expense {args.id}")
+        return 0
+    
+    def cmd_report(self, args: argparse.Namespace) -> int:
+        """Print a report or show charts without entering the menu."""
+        if args.period is None and args.date is not None:
+            print("Error: --date needs --period.")
+            return 1
+        if args.period is not None:
+            if args.kind != 'summary':
+                print("Error: --period only applies to the summary report.")
+                return 1
+            try:
+                self.reports.print_period_summary(args.period, args.date)
+            except ValueError as e:
+                print(f"Error: {e}")
+                return 1
+        elif args.kind == 'summary':
+            self.show_summaries()
+        elif args.kind == 'stats':
+            self.show_stats()
+        elif args.kind == 'charts':
+            self.reports.generate_all_charts(save_path=args.save, show=not args.no_show)
+        else:
+            self.show_detailed_report()
+        return 0
+    
+    def cmd_export(self, args: argparse.Namespace) -> int:
+        """Export all expenses to CSV from command-line arguments."""
+        try:
+            self.reports.export_to_csv(args.output)
+        except OSError as e:
+            print(f"Error: Could not write export: {e}")
+            return 1
+        return 0
     
     def run(self) -> None:
         """Run the main CLI loop."""
         print("Personal Expense Tracker")
-        print("=" * 50)
+        print(EQ50)
         
         while True:
-            print("\nMain Menu:")
-            print("1. Add Expense")
-            print("2. List Expenses")
-            print("3. Delete Expense")
-            print("4. Show Summaries")
-            print("5. Show Charts")
-            print("6. Detailed Report")
-            print("7. Statistics")
-            print("0. Exit")
+            print(self.MAIN_MENU)
             
-            choice = input("\nSelect option (0-7): ").strip()
+            choice = input("\nSelect option (0-8): ").strip()
             
             if choice == '0':
                 print("\nThank you for using Personal Expense Tracker!")
                 print("Goodbye! 👋")
                 break
-            elif choice == '1':
-                self.add_expense()
-            elif choice == '2':
-                limit_input = input("Enter number of expenses to show (or press Enter for all): ").strip()
-                limit = int(limit_input) if limit_input.isdigit() else None
-                self.list_expenses(limit)
-            elif choice == '3':
-                self.delete_expense()
-            elif choice == '4':
-                self.show_summaries()
-            elif choice == '5':
-                self.show_charts()
-            elif choice == '6':
-                self.show_detailed_report()
-            elif choice == '7':
-                self.show_stats()
-            else:
-                print("Invalid option. Please try again.")
+            getattr(self, self.MAIN_HANDLERS.get(choice, '_invalid_option'))()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the parser for the scripted subcommands."""
+    parser = argparse.ArgumentParser(
+        description="Personal Expense Tracker. Run without a command for the interactive menu.")
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    
+    add = subparsers.add_parser('add', help='add an expense')
+    add.add_argument('category')
+    add.add_argument('description')
+    add.add_argument('amount')
+    add.add_argument('--date', help='YYYY-MM-DD (default: today)')
+    add.set_defaults(handler='cmd_add')
+    
+    list_ = subparsers.add_parser('list', help='list expenses, newest first')
+    list_.add_argument('--limit', type=_positive_int, help='show at most this many expenses')
+    list_.set_defaults(handler='cmd_list')
+    
+    delete = subparsers.add_parser('delete', help='delete expenses by ID')
+    delete.add_argument('ids', type=int, nargs='+', metavar='id')
+    delete.set_defaults(handler='cmd_delete')
+    
+    edit = subparsers.add_parser('edit', help='change fields of an expense')
+    edit.add_argument('id', type=int)
+    edit.add_argument('--date', help='YYYY-MM-DD')
+    edit.add_argument('--category')
+    edit.add_argument('--description')
+    edit.add_argument('--amount')
+    edit.set_defaults(handler='cmd_edit')
+    
+    report = subparsers.add_parser('report', help='print a report or show charts')
+    report.add_argument('kind', nargs='?', default='detailed',
+                        choices=['detailed', 'summary', 'stats', 'charts'])
+    report.add_argument('--period', choices=sorted(PERIODS),
+                        help='summarize only the week, month or year containing --date')
+    report.add_argument('--date', help='YYYY-MM-DD inside the period (default: today)')
+    report.add_argument('--save', help='image path for the charts report')
+    report.add_argument('--no-show', action='store_true',
+                        help='only save the charts, without opening a window')
+    report.set_defaults(handler='cmd_report')
+    
+    export = subparsers.add_parser('export', help='export all expenses to CSV')
+    export.add_argument('--output', help='CSV path (default: exports/expenses_<timestamp>.csv)')
+    export.set_defaults(handler='cmd_export')
+    
+    return parser
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main entry point for the application."""
+    args = _build_parser().parse_args(argv)
+    
     try:
-        app = ExpenseTrackerCLI()
-        app.run()
+        if args.command is None:
+            app = ExpenseTrackerCLI()
+            app.run()
+        else:
+            # One operation per process: no menu, no sample data
+            app = ExpenseTrackerCLI(seed_sample_data=False)
+            sys.exit(getattr(app, args.handler)(args))
     except KeyboardInterrupt:
         print("\n\nApplication interrupted by user.")
         sys.exit(0)
@@ -5,19 +5,95 @@ This module generates various reports and visualizations using matplotlib
 for expense analysis and summaries.
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import csv
+from contextlib import closing
+from datetime import date, datetime, timedelta
+from math import fsum
+from typing import Dict, List, Optional, Set, Tuple
+import io
 import os
+import sys
 from pathlib import Path
 
-from database import ExpenseDatabase
+from database import ExpenseDatabase, EXPENSE_COLUMNS
+
+# Banner rules, built once at import rather than on every menu and report
+EQ50 = "=" * 50
+EQ60 = "=" * 60
+DASH50 = "-" * 50
+DASH60 = "-" * 60
+
+# Raster resolution for saved charts; 300 dpi renders 9x the pixels for no
+# visible gain on screen
+SAVE_DPI = 100
+
+# matplotlib is imported and styled on the first chart of the process, so
+# text-only sessions never pay its start-up cost
+_SETUP_DONE = False
+
+# Pie chart palette (RGBA rows of the 12-colour Set3 map), filled in lazily
+_SET3_SIZE = 12
+_SET3_PALETTE = None
+
+
+def _setup_matplotlib() -> None:
+    """Configure matplotlib for better visualizations (once per process)."""
+    global _SETUP_DONE
+    if _SETUP_DONE:
+        return
+    
+    # The backend has to be chosen before pyplot is first imported
+    if os.environ.get('EXPENSE_HEADLESS') == '1':
+        import matplotlib
+        matplotlib.use('Agg')
+    
+    import matplotlib.pyplot as plt
+    
+    plt.style.use('default')
+    plt.rcParams['figure.figsize'] = (12, 8)
+    plt.rcParams['font.size'] = 10
+    plt.rcParams['axes.grid'] = True
+    plt.rcParams['grid.alpha'] = 0.3
+    _SETUP_DONE = True
+
+
+def _pie_colors(count: int):
+    """
+    Get `count` Set3 colours, looked up from a palette built on first use.
+    
+    Set3 has 12 colours; larger counts fall back to the colormap itself.
+    """
+    global _SET3_PALETTE
+    import matplotlib.pyplot as plt
+    
+    if count > _SET3_SIZE:
+        return plt.cm.Set3(range(count))
+    if _SET3_PALETTE is None:
+        _SET3_PALETTE = plt.cm.Set3(range(_SET3_SIZE))
+    return _SET3_PALETTE[:count]
+
+
+def _agg_figure(figsize: Tuple[float, float]):
+    """
+    Create a standalone Figure on an Agg canvas, outside pyplot.
+    
+    Save-only charts are drawn on these, so they never touch pyplot's
+    backend, its open windows or the GUI toolkit.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
 
 
 class ExpenseReports:
     """Handles generation of expense reports and visualizations."""
     
+    # Export directories already created (or found) by this process
+    _export_dirs: Set[str] = set()
+    
     def __init__(self, db: ExpenseDatabase):
         """
         Initialize the reports generator.
@@ -26,22 +102,26 @@ class ExpenseReports:
             db: ExpenseDatabase instance
         """
         self.db = db
-        self._setup_matplotlib()
+        # Single-chart Figure and Axes, created on the first chart and reused;
+        # the Agg pair serves save-only (show=False) charts
+        self._fig = None
+        self._ax = None
+        self._agg_fig = None
+        self._agg_ax = None
+        # 2x2 pyplot Figure and Axes array for generate_all_charts, reused the same way
+        self._grid_fig = None
+        self._grid_ax = None
     
-    def _setup_matplotlib(self) -> None:
-        """Configure matplotlib for better visualizations."""
-        plt.style.use('default')
-        plt.rcParams['figure.figsize'] = (12, 8)
-        plt.rcParams['font.size'] = 10
-        plt.rcParams['axes.grid'] = True
-        plt.rcParams['grid.alpha'] = 0.3
-    
-    def generate_category_chart(self, save_path: Optional[str] = None) -> None:
+    def generate_category_chart(self, save_path: Optional[str] = None, show: bool = True,
+                                ax=None) -> None:
         """
         Generate a bar chart showing expenses by category.
         
         Args:
-            save_path: Optional path to save the chart image
+            save_path: Optional path to save the chart image (format from its extension)
+            show: Display the chart window; pass False for batch export
+            ax: Existing matplotlib Axes to draw into instead of a new figure;
+                save_path and show are then ignored
         """
         category_totals = self.db.get_category_totals()
         
@@ -49,11 +129,26 @@ class ExpenseReports:
             print("No expense data available for category chart.")
             return
         
+        if ax is not None:
+            # Caller-owned Axes: just draw, saving and showing are up to them
+            self._draw_category_chart(ax, category_totals)
+            return
+        
+        fig, ax = self._chart_axes((12, 6), show)
+        self._draw_category_chart(ax, category_totals)
+        
+        # Adjust layout to prevent label cutoff
+        fig.tight_layout()
+        self._finish_figure(fig, save_path, "Category chart", show)
+    
+    def _draw_category_chart(self, ax, category_totals: Dict[str, float]) -> None:
+        """Draw the category bar chart onto the given Axes."""
+        import matplotlib.pyplot as plt
+        
         categories = list(category_totals.keys())
         amounts = list(category_totals.values())
         
         # Create the bar chart
-        fig, ax = plt.subplots(figsize=(12, 6))
         bars = ax.bar(categories, amounts, color='skyblue', edgecolor='navy', alpha=0.7)
         
         # Customize the chart
@@ -62,29 +157,22 @@ class ExpenseReports:
         ax.set_ylabel('Amount ($)', fontsize=12)
         
         # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45, ha='right')
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
         
         # Add value labels on bars
-        for bar, amount in zip(bars, amounts):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + max(amounts)*0.01,
-                   f'${amount:.2f}', ha='center', va='bottom', fontweight='bold')
-        
-        # Adjust layout to prevent label cutoff
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Category chart saved to: {save_path}")
-        
-        plt.show()
+        ax.bar_label(bars, labels=[f'${amount:.2f}' for amount in amounts],
+                     padding=3, fontweight='bold')
     
-    def generate_monthly_chart(self, save_path: Optional[str] = None) -> None:
+    def generate_monthly_chart(self, save_path: Optional[str] = None, show: bool = True,
+                               ax=None) -> None:
         """
         Generate a bar chart showing expenses by month.
         
         Args:
-            save_path: Optional path to save the chart image
+            save_path: Optional path to save the chart image (format from its extension)
+            show: Display the chart window; pass False for batch export
+            ax: Existing matplotlib Axes to draw into instead of a new figure;
+                save_path and show are then ignored
         """
         monthly_totals = self.db.get_monthly_totals()
         
@@ -92,13 +180,26 @@ class ExpenseReports:
             print("No expense data available for monthly chart.")
             return
         
-        # Sort months chronologically
-        sorted_months = sorted(monthly_totals.items())
-        months = [item[0] for item in sorted_months]
-        amounts = [item[1] for item in sorted_months]
+        if ax is not None:
+            self._draw_monthly_chart(ax, monthly_totals)
+            return
+        
+        fig, ax = self._chart_axes((12, 6), show)
+        self._draw_monthly_chart(ax, monthly_totals)
+        
+        # Adjust layout to prevent label cutoff
+        fig.tight_layout()
+        self._finish_figure(fig, save_path, "Monthly chart", show)
+    
+    def _draw_monthly_chart(self, ax, monthly_totals: Dict[str, float]) -> None:
+        """Draw the monthly bar chart onto the given Axes."""
+        import matplotlib.pyplot as plt
+        
+        # Totals arrive newest month first (SQL ORDER BY); plot chronologically
+        months = list(monthly_totals)[::-1]
+        amounts = list(monthly_totals.values())[::-1]
         
         # Create the bar chart
-        fig, ax = plt.subplots(figsize=(12, 6))
         bars = ax.bar(months, amounts, color='lightcoral', edgecolor='darkred', alpha=0.7)
         
         # Customize the chart
@@ -107,29 +208,22 @@ class ExpenseReports:
         ax.set_ylabel('Amount ($)', fontsize=12)
         
         # Rotate x-axis labels for better readability
-        plt.xticks(rotation=45, ha='right')
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
         
         # Add value labels on bars
-        for bar, amount in zip(bars, amounts):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + max(amounts)*0.01,
-                   f'${amount:.2f}', ha='center', va='bottom', fontweight='bold')
-        
-        # Adjust layout to prevent label cutoff
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Monthly chart saved to: {save_path}")
-        
-        plt.show()
+        ax.bar_label(bars, labels=[f'${amount:.2f}' for amount in amounts],
+                     padding=3, fontweight='bold')
     
-    def generate_pie_chart(self, save_path: Optional[str] = None) -> None:
+    def generate_pie_chart(self, save_path: Optional[str] = None, show: bool = True,
+                           ax=None) -> None:
         """
         Generate a pie chart showing expense distribution by category.
         
         Args:
-            save_path: Optional path to save the chart image
+            save_path: Optional path to save the chart image (format from its extension)
+            show: Display the chart window; pass False for batch export
+            ax: Existing matplotlib Axes to draw into instead of a new figure;
+                save_path and show are then ignored
         """
         category_totals = self.db.get_category_totals()
         
@@ -137,12 +231,21 @@ class ExpenseReports:
             print("No expense data available for pie chart.")
             return
         
+        if ax is not None:
+            self._draw_pie_chart(ax, category_totals)
+            return
+        
+        fig, ax = self._chart_axes((10, 8), show)
+        self._draw_pie_chart(ax, category_totals)
+        self._finish_figure(fig, save_path, "Pie chart", show)
+    
+    def _draw_pie_chart(self, ax, category_totals: Dict[str, float]) -> None:
+        """Draw the category pie chart onto the given Axes."""
         categories = list(category_totals.keys())
         amounts = list(category_totals.values())
         
         # Create the pie chart
-        fig, ax = plt.subplots(figsize=(10, 8))
-        colors = plt.cm.Set3(range(len(categories)))
+        colors = _pie_colors(len(categories))
         
         wedges, texts, autotexts = ax.pie(amounts, labels=categories, autopct='%1.1f%%',
                                          colors=colors, startangle=90)
@@ -157,53 +260,57 @@ class ExpenseReports:
         
         # Equal aspect ratio ensures that pie is drawn as a circle
         ax.axis('equal')
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Pie chart saved to: {save_path}")
-        
-        plt.show()
     
-    def generate_trend_chart(self, days: int = 30, save_path: Optional[str] = None) -> None:
+    def generate_trend_chart(self, days: int = 30, save_path: Optional[str] = None,
+                             show: bool = True, ax=None) -> None:
         """
         Generate a line chart showing expense trends over time.
         
         Args:
             days: Number of days to show in the trend
-            save_path: Optional path to save the chart image
+            save_path: Optional path to save the chart image (format from its extension)
+            show: Display the chart window; pass False for batch export
+            ax: Existing matplotlib Axes to draw into instead of a new figure;
+                save_path and show are then ignored
         """
-        # Get expenses from the last N days
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
-        
-        expenses = self.db.get_all_expenses()
+        daily_totals = self._trend_totals(days)
         
-        # Filter expenses by date range
-        filtered_expenses = []
-        for expense in expenses:
-            expense_date = datetime.strptime(expense['date'], '%Y-%m-%d')
-            if start_date <= expense_date <= end_date:
-                filtered_expenses.append(expense)
-        
-        if not filtered_expenses:
+        if not daily_totals:
             print(f"No expense data available for the last {days} days.")
             return
         
-        # Group expenses by date
-        daily_totals = {}
-        for expense in filtered_expenses:
-            date = expense['date']
-            if date not in daily_totals:
-                daily_totals[date] = 0
-            daily_totals[date] += expense['amount']
+        if ax is not None:
+            self._draw_trend_chart(ax, daily_totals, days)
+            return
+        
+        fig, ax = self._chart_axes((12, 6), show)
+        self._draw_trend_chart(ax, daily_totals, days)
+        
+        # Adjust layout
+        fig.tight_layout()
+        self._finish_figure(fig, save_path, "Trend chart", show)
+    
+    def _trend_totals(self, days: int) -> Dict[str, float]:
+        """Fetch per-day totals for the last `days` days, oldest first."""
+        # The window covers the last `days` days up to and including today;
+        # ISO date strings compare correctly, so the range goes straight to SQL
+        today = date.today()
+        start_iso = (today - timedelta(days=days - 1)).isoformat()
+        end_iso = (today + timedelta(days=1)).isoformat()
+        
+        return self.db.get_daily_totals_between(start_iso, end_iso)
+    
+    def _draw_trend_chart(self, ax, daily_totals: Dict[str, float], days: int = 30) -> None:
+        """Draw the daily trend chart onto the given Axes."""
+        import matplotlib.pyplot as plt
+        import matplotlib.dates as mdates
         
-        # Sort dates
-        sorted_dates = sorted(daily_totals.items())
-        dates = [datetime.strptime(item[0], '%Y-%m-%d') for item in sorted_dates]
-        amounts = [item[1] for item in sorted_dates]
+        # Only the distinct dates in the window are parsed, and fromisoformat
+        # skips strptime's locale-aware format parsing
+        dates = [date.fromisoformat(day) for day in daily_totals]
+        amounts = list(daily_totals.values())
         
         # Create the line chart
-        fig, ax = plt.subplots(figsize=(12, 6))
         ax.plot(dates, amounts, marker='o', linewidth=2, markersize=6, color='green')
         
         # Customize the chart
@@ -214,19 +321,115 @@ class ExpenseReports:
         # Format x-axis dates
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
         ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, days//10)))
-        plt.xticks(rotation=45)
+        plt.setp(ax.get_xticklabels(), rotation=45)
         
         # Add grid
         ax.grid(True, alpha=0.3)
+    
+    def generate_all_charts(self, days: int = 30, save_path: Optional[str] = None,
+                            show: bool = True) -> None:
+        """
+        Generate the category, monthly, pie and trend charts as one 2x2 figure.
         
-        # Adjust layout
-        plt.tight_layout()
+        Each query runs once (the category totals feed both the bar and the
+        pie panel) and the figure is laid out and shown a single time.
+        
+        Args:
+            days: Number of days to show in the trend panel
+            save_path: Optional path to save the combined chart image
+            show: Display the chart window; pass False for batch export
+        """
+        category_totals = self.db.get_category_totals()
+        monthly_totals = self.db.get_monthly_totals()
+        daily_totals = self._trend_totals(days)
+        
+        if not (category_totals or monthly_totals or daily_totals):
+            print("No expense data available for charts.")
+            return
+        
+        print("Generating all charts...")
+        fig, axes = self._chart_grid(show)
+        
+        panels = (
+            (axes[0, 0], self._draw_category_chart, (category_totals,)),
+            (axes[0, 1], self._draw_monthly_chart, (monthly_totals,)),
+            (axes[1, 0], self._draw_pie_chart, (category_totals,)),
+            (axes[1, 1], self._draw_trend_chart, (daily_totals, days)),
+        )
+        for ax, draw, args in panels:
+            if args[0]:
+                draw(ax, *args)
+            else:
+                # Keep the grid shape when one dataset is empty
+                ax.text(0.5, 0.5, 'No data', ha='center', va='center', transform=ax.transAxes)
+                ax.set_axis_off()
+        
+        fig.tight_layout()
+        self._finish_figure(fig, save_path, "Charts", show)
+    
+    def _chart_axes(self, figsize: Tuple[float, float], show: bool = True):
+        """
+        Get the reusable single-chart Figure and Axes, cleared and resized.
+        
+        Building a Figure is a large share of matplotlib's render time, so
+        one is kept per instance and redrawn. Charts that will be shown use a
+        pyplot figure, remade only after its window was closed; save-only
+        charts use a standalone Agg figure that pyplot never closes.
+        """
+        _setup_matplotlib()
+        
+        if not show:
+            if self._agg_fig is None:
+                self._agg_fig = _agg_figure(figsize)
+                self._agg_ax = self._agg_fig.subplots()
+            else:
+                self._agg_ax.clear()
+                self._agg_fig.set_size_inches(*figsize)
+            return self._agg_fig, self._agg_ax
+        
+        import matplotlib.pyplot as plt
+        
+        if self._fig is None or not plt.fignum_exists(self._fig.number):
+            self._fig, self._ax = plt.subplots(figsize=figsize)
+        else:
+            self._ax.clear()
+            self._fig.set_size_inches(*figsize)
+        return self._fig, self._ax
+    
+    def _chart_grid(self, show: bool = True):
+        """
+        Get a cleared 2x2 Figure and Axes array for generate_all_charts.
         
+        Shown grids reuse one pyplot figure, as _chart_axes does, so repeated
+        calls do not pile up figures when show() returns without blocking.
+        Save-only grids are standalone Agg figures that pyplot never tracks.
+        """
+        _setup_matplotlib()
+        
+        if not show:
+            fig = _agg_figure((16, 12))
+            return fig, fig.subplots(2, 2)
+        
+        import matplotlib.pyplot as plt
+        
+        if self._grid_fig is None or not plt.fignum_exists(self._grid_fig.number):
+            self._grid_fig, self._grid_ax = plt.subplots(2, 2, figsize=(16, 12))
+        else:
+            for ax in self._grid_ax.flat:
+                ax.clear()
+                # An empty panel from the last call had its axis turned off
+                ax.set_axis_on()
+        return self._grid_fig, self._grid_ax
+    
+    def _finish_figure(self, fig, save_path: Optional[str], label: str, show: bool) -> None:
+        """Save the figure if a path was given, then show it if asked to."""
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Trend chart saved to: {save_path}")
+            fig.savefig(save_path, dpi=SAVE_DPI, bbox_inches='tight')
+            print(f"{label} saved to: {save_path}")
         
-        plt.show()
+        if show:
+            import matplotlib.pyplot as plt
+            plt.show()
     
     def print_category_summary(self) -> None:
         """Print a formatted summary of expenses by category."""
@@ -236,19 +439,26 @@ class ExpenseReports:
             print("No expense data available.")
             return
         
-        print("\n" + "="*50)
-        print("CATEGORY SUMMARY")
-        print("="*50)
+        buf = io.StringIO()
+        print("\n" + EQ50, file=buf)
+        print("CATEGORY SUMMARY", file=buf)
+        print(EQ50, file=buf)
+        
+        # fsum avoids accumulated float rounding error in the grand total
+        total_amount = fsum(category_totals.values())
         
-        total_amount = sum(category_totals.values())
+        # One division up front instead of one per row; an all-zero total
+        # shows 0% rather than raising
+        scale = 100 / total_amount if total_amount else 0.0
         
-        for category, amount in sorted(category_totals.items(), key=lambda x: x[1], reverse=True):
-            percentage = (amount / total_amount) * 100
-            print(f"{category:<20} ${amount:>8.2f} ({percentage:>5.1f}%)")
+        # Already ordered by total, largest first, by the SQL query
+        for category, amount in category_totals.items():
+            print(f"{category:<20} ${amount:>8.2f} ({amount * scale:>5.1f}%)", file=buf)
         
-        print("-"*50)
-        print(f"{'TOTAL':<20} ${total_amount:>8.2f}")
-        print("="*50)
+        print(DASH50, file=buf)
+        print(f"{'TOTAL':<20} ${total_amount:>8.2f}", file=buf)
+        print(EQ50, file=buf)
+        sys.stdout.write(buf.getvalue())
     
     def print_monthly_summary(self) -> None:
         """Print a formatted summary of expenses by month."""
@@ -258,53 +468,128 @@ class ExpenseReports:
             print("No expense data available.")
             return
         
-        print("\n" + "="*50)
-        print("MONTHLY SUMMARY")
-        print("="*50)
+        buf = io.StringIO()
+        print("\n" + EQ50, file=buf)
+        print("MONTHLY SUMMARY", file=buf)
+        print(EQ50, file=buf)
         
-        total_amount = sum(monthly_totals.values())
+        total_amount = fsum(monthly_totals.values())
         
-        for month, amount in sorted(monthly_totals.items(), reverse=True):
-            percentage = (amount / total_amount) * 100
-            print(f"{month:<15} ${amount:>8.2f} ({percentage:>5.1f}%)")
+        scale = 100 / total_amount if total_amount else 0.0
         
-        print("-"*50)
-        print(f"{'TOTAL':<15} ${total_amount:>8.2f}")
-        print("="*50)
+        # Already ordered newest month first by the SQL query
+        for month, amount in monthly_totals.items():
+            print(f"{month:<15} ${amount:>8.2f} ({amount * scale:>5.1f}%)", file=buf)
+        
+        print(DASH50, file=buf)
+        print(f"{'TOTAL':<15} ${total_amount:>8.2f}", file=buf)
+        print(EQ50, file=buf)
+        sys.stdout.write(buf.getvalue())
+    
+    def print_period_summary(self, period: str, reference_date: Optional[str] = None) -> None:
+        """
+        Print the per-category spending for one week, month or year.
+        
+        Args:
+            period: 'weekly', 'monthly' or 'yearly'
+            reference_date: Date inside the period (YYYY-MM-DD), defaults to today
+            
+        Raises:
+            ValueError: If period is unknown or reference_date is invalid
+        """
+        total_amount, category_totals = self.db.get_period_summary(period, reference_date)
+        
+        if not category_totals:
+            print("No expenses in this period.")
+            return
+        
+        buf = io.StringIO()
+        print("\n" + EQ50, file=buf)
+        print(f"{period.upper()} SUMMARY ({reference_date or date.today().isoformat()})", file=buf)
+        print(EQ50, file=buf)
+        
+        scale = 100 / total_amount if total_amount else 0.0
+        
+        # Already ordered by total, largest first, by the SQL query
+        for category, amount in category_totals.items():
+            print(f"{category:<20} ${amount:>8.2f} ({amount * scale:>5.1f}%)", file=buf)
+        
+        print(DASH50, file=buf)
+        print(f"{'TOTAL':<20} ${total_amount:>8.2f}", file=buf)
+        print(EQ50, file=buf)
+        sys.stdout.write(buf.getvalue())
     
     def print_detailed_report(self) -> None:
         """Print a comprehensive expense report."""
-        expenses = self.db.get_all_expenses()
-        stats = self.db.get_database_stats()
+        # Totals and the recent rows come from one bundled snapshot
+        bundle = self.db.get_report_bundle()
+        recent = bundle['recent_expenses']
         
-        if not expenses:
+        if not bundle['total_expenses']:
             print("No expense data available.")
             return
         
-        print("\n" + "="*60)
-        print("DETAILED EXPENSE REPORT")
-        print("="*60)
+        buf = io.StringIO()
+        print("\n" + EQ60, file=buf)
+        print("DETAILED EXPENSE REPORT", file=buf)
+        print(EQ60, file=buf)
         
         # Overall statistics
-        print(f"Total Expenses: {stats['total_expenses']}")
-        print(f"Total Amount: ${stats['total_amount']:.2f}")
-        print(f"Categories: {stats['total_categories']}")
-        print(f"Average per Expense: ${stats['total_amount']/stats['total_expenses']:.2f}")
+        print(f"Total Expenses: {bundle['total_expenses']}", file=buf)
+        print(f"Total Amount: ${bundle['total_amount']:.2f}", file=buf)
+        print(f"Categories: {bundle['total_categories']}", file=buf)
+        print(f"Average per Expense: ${bundle['total_amount']/bundle['total_expenses']:.2f}", file=buf)
         
         # Recent expenses
-        print(f"\nRecent Expenses (Last 10):")
-        print("-"*60)
-        print(f"{'ID':<4} {'Date':<12} {'Category':<15} {'Description':<20} {'Amount':<10}")
-        print("-"*60)
+        print(f"\nRecent Expenses (Last 10):", file=buf)
+        print(DASH60, file=buf)
+        print(f"{'ID':<4} {'Date':<12} {'Category':<15} {'Description':<20} {'Amount':<10}", file=buf)
+        print(DASH60, file=buf)
+        
+        for expense in recent:
+            print(f"{expense.id:<4} {expense.date:<12} {expense.category:<15} "
+                  f"{expense.description[:19]:<20} ${expense.amount:<9.2f}", file=buf)
         
-        for expense in expenses[:10]:
-            print(f"{expense['id']:<4} {expense['date']:<12} {expense['category']:<15} "
-                  f"{expense['description'][:19]:<20} ${expense['amount']:<9.2f}")
+        if bundle['total_expenses'] > len(recent):
+            print(f"... and {bundle['total_expenses'] - len(recent)} more expenses", file=buf)
         
-        if len(expenses) > 10:
-            print(f"... and {len(expenses) - 10} more expenses")
+        print(EQ60, file=buf)
         
-        print("="*60)
+        # Emit the whole report with one write instead of a print() per line
+        sys.stdout.write(buf.getvalue())
+    
+    
+    def export_to_csv(self, file_path: Optional[str] = None) -> str:
+        """
+        Export all expenses to a CSV file, newest first.
+        
+        Args:
+            file_path: Destination path (default: exports/expenses_<timestamp>.csv)
+            
+        Returns:
+            Path of the written file
+        """
+        if file_path is None:
+            exports_dir = Path("exports")
+            # Create (or stat) the directory once per process and working directory
+            dir_key = os.path.abspath(exports_dir)
+            if dir_key not in self._export_dirs:
+                exports_dir.mkdir(exist_ok=True)
+                self._export_dirs.add(dir_key)
+            file_path = str(exports_dir / f"expenses_{datetime.now():%Y%m%d_%H%M%S}.csv")
+        
+        # Rows stream off the cursor as tuples in EXPENSE_COLUMNS order, so
+        # csv.writer takes them as-is; the 1 MB buffer keeps large exports to
+        # few write calls
+        with open(file_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPENSE_COLUMNS)
+            # closing() hands the pooled reader back even if writing fails
+            with closing(self.db.stream_expenses()) as rows:
+                writer.writerows(rows)
+        
+        print(f"Expenses exported to: {file_path}")
+        return file_path
 
 
 # TODO: Add Streamlit UI version for web visualization
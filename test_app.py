@@ -73,11 +73,11 @@ def test_expense_tracker():
     print("\n7. Testing expense deletion...")
     if all_expenses:
         expense_to_delete = all_expenses[0]
-        success = db.delete_expense(expense_to_delete['id'])
+        success = db.delete_expense(expense_to_delete.id)
         if success:
-            print(f"   ✅ Successfully deleted expense ID {expense_to_delete['id']}")
+            print(f"   ✅ Successfully deleted expense ID {expense_to_delete.id}")
         else:
-            print(f"   ❌ Failed to delete expense ID {expense_to_delete['id']}")
+            print(f"   ❌ Failed to delete expense ID {expense_to_delete.id}")
     
     # Final statistics
     print("\n8. Final statistics...")
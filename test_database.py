@@ -0,0 +1,249 @@
+"""
+Tests for database.py: the writer/reader-pool connection model, the
+aggregate cache, batched inserts and the update_expense field masks.
+
+Run with pytest from the project root.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+import database
+from database import ExpenseDatabase, _ReaderPool
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path to a fresh database file for one test."""
+    return str(tmp_path / "expenses.db")
+
+
+@pytest.fixture
+def db(db_path):
+    """ExpenseDatabase on a fresh file, closed after the test."""
+    db = ExpenseDatabase(db_path)
+    yield db
+    db.close()
+
+
+def test_write_is_visible_to_another_instance(db, db_path):
+    """Rows committed by one instance are read by another instance's pooled readers."""
+    other = ExpenseDatabase(db_path)
+    try:
+        # Open a pooled reader before the write so it is reused afterwards
+        assert other.get_all_expenses() == []
+        
+        expense_id = db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+        
+        expense = other.get_expense_by_id(expense_id)
+        assert expense is not None
+        assert (expense.category, expense.amount) == ("Food", 12.5)
+        assert other.get_database_stats()['total_expenses'] == 1
+    finally:
+        other.close()
+
+
+def test_cached_aggregates_see_another_instances_write(db, db_path):
+    """Aggregates cached before another instance writes are recomputed afterwards."""
+    other = ExpenseDatabase(db_path)
+    try:
+        assert other.get_database_stats()['total_expenses'] == 0
+        assert other.get_category_totals() == {}
+        assert other.get_monthly_totals() == {}
+        
+        db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+        
+        assert other.get_database_stats()['total_expenses'] == 1
+        assert other.get_category_totals() == {"Food": 12.5}
+        assert other.get_monthly_totals() == {"2024-01": 12.5}
+        assert other.get_report_bundle()['total_amount'] == 12.5
+    finally:
+        other.close()
+
+
+def test_report_bundle_returns_under_constant_writes(db, monkeypatch):
+    """The bundle gives up retrying rather than waiting for writes to stop."""
+    db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+    # Every read of the revision looks like a new write landed
+    ticks = iter(range(1000))
+    monkeypatch.setattr(ExpenseDatabase, "revision", property(lambda self: (next(ticks), 0)))
+    
+    bundle = db.get_report_bundle()
+    
+    assert bundle['total_expenses'] == 1
+    assert [e.description for e in bundle['recent_expenses']] == ["Lunch"]
+
+
+def test_memory_database_shares_the_writer():
+    """An in-memory database has no reader pool; reads go through the writer."""
+    db = ExpenseDatabase(":memory:")
+    try:
+        assert db._readers is None
+        with db.reader() as conn:
+            assert conn is db._writer
+        
+        db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+        assert len(db.get_all_expenses()) == 1
+        assert db.get_database_stats()['total_amount'] == 12.5
+    finally:
+        db.close()
+
+
+def test_memory_stream_does_not_hold_the_lock():
+    """A half-consumed stream on :memory: must not block writes."""
+    db = ExpenseDatabase(":memory:")
+    try:
+        db.add_sample_data()
+        rows = db.stream_expenses()
+        next(rows)
+        
+        assert not db._lock.locked()
+        db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+        rows.close()
+    finally:
+        db.close()
+
+
+def test_pool_blocks_when_exhausted_until_release(db_path):
+    """With every reader borrowed, acquire() waits for a release."""
+    ExpenseDatabase(db_path).close()
+    pool = _ReaderPool(db_path, max_readers=1)
+    try:
+        first = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        
+        waiter.join(0.2)
+        assert waiter.is_alive()
+        assert acquired == []
+        
+        pool.release(first)
+        waiter.join(5)
+        assert not waiter.is_alive()
+        assert acquired == [first]
+        assert len(pool._connections) == 1
+    finally:
+        pool.close()
+
+
+def test_reader_is_returned_after_a_failed_query(db):
+    """A reader goes back to the pool even if the with block raises."""
+    db._readers.max_readers = 1
+    
+    with pytest.raises(RuntimeError):
+        with db.reader():
+            raise RuntimeError("query failed")
+    
+    assert db._readers._idle.qsize() == 1
+    assert db.get_all_expenses() == []
+
+
+def test_readers_are_read_only(db):
+    """Pooled readers reject writes."""
+    with db.reader() as conn:
+        with pytest.raises(Exception):
+            conn.cursor().execute(
+                "INSERT INTO expenses (date, category, description, amount) "
+                "VALUES ('2024-01-15', 'Food', 'Lunch', 1)")
+
+
+def test_reader_falls_back_to_sqlite3(db_path, monkeypatch):
+    """Without apsw the pool opens stdlib sqlite3 connections."""
+    monkeypatch.setattr(database, "apsw", None)
+    db = ExpenseDatabase(db_path)
+    try:
+        db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+        with db.reader() as conn:
+            assert isinstance(conn, sqlite3.Connection)
+        assert len(db.get_all_expenses()) == 1
+    finally:
+        db.close()
+
+
+def test_reader_uses_apsw_when_installed(db):
+    """With apsw installed, pooled readers are apsw connections and queries still work."""
+    apsw = pytest.importorskip("apsw")
+    
+    db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+    with db.reader() as conn:
+        assert isinstance(conn, apsw.Connection)
+    
+    expense = db.get_all_expenses()[0]
+    assert (expense.date, expense.category, expense.amount) == ("2024-01-15", "Food", 12.5)
+    assert db.get_category_totals() == {"Food": 12.5}
+    assert [row[0] for row in db.stream_expenses()] == [expense.id]
+
+
+def test_bulk_insert_with_a_partial_last_batch(db):
+    """A row count that is not a multiple of ROWS_PER_INSERT inserts every row, in order."""
+    count = 8 * database.ROWS_PER_INSERT + 3
+    rows = [("2024-01-15", f"Cat{i % 7}", f"Item {i}", float(i)) for i in range(count)]
+    
+    assert db.add_expenses_bulk(rows) == count
+    
+    stats = db.get_database_stats()
+    assert stats['total_expenses'] == count
+    assert stats['total_amount'] == sum(range(count))
+    # order_by='id' lists the most recently added first
+    expenses = db.get_expenses(order_by='id')
+    assert [e.description for e in reversed(expenses)] == [f"Item {i}" for i in range(count)]
+
+
+def test_bulk_insert_rejects_an_invalid_row_before_writing(db):
+    """A bad row in the middle of the batch leaves the table untouched."""
+    rows = [("2024-01-15", "Food", f"Item {i}", 1.0) for i in range(1003)]
+    rows[600] = ("2024-02-30", "Food", "Bad date", 1.0)
+    
+    with pytest.raises(ValueError):
+        db.add_expenses_bulk(rows)
+    
+    assert db.get_database_stats()['total_expenses'] == 0
+
+
+def test_bulk_insert_rolls_back_on_a_failed_batch(db):
+    """A statement failing after earlier batches were written rolls all of them back."""
+    rows = [("2024-01-15", "Food", f"Item {i}", 1.0) for i in range(1003)]
+    # Passes validation but violates NOT NULL in the fifth INSERT statement
+    rows[600] = ("2024-01-15", None, "No category", 1.0)
+    
+    with pytest.raises(sqlite3.IntegrityError):
+        db.add_expenses_bulk(rows)
+    
+    assert db.get_database_stats()['total_expenses'] == 0
+    assert db.add_expenses_bulk(rows[:3]) == 3
+
+
+UPDATED_VALUES = {
+    'date': "2025-06-30",
+    'category': "Travel",
+    'description': "Taxi",
+    'amount': 99.0,
+}
+
+
+@pytest.mark.parametrize("mask", sorted(database.UPDATE_SQL))
+def test_update_expense_field_masks(db, mask):
+    """Every combination of fields updates exactly those fields."""
+    original = ("2024-01-15", "Food", "Lunch", 12.5)
+    expense_id = db.add_expense(*original)
+    fields = [field for bit, field in enumerate(database.UPDATE_FIELDS)
+              if mask & (0b1000 >> bit)]
+    
+    assert db.update_expense(expense_id, **{f: UPDATED_VALUES[f] for f in fields})
+    
+    expense = db.get_expense_by_id(expense_id)
+    for field, old in zip(database.UPDATE_FIELDS, original):
+        expected = UPDATED_VALUES[field] if field in fields else old
+        assert getattr(expense, field) == expected
+
+
+def test_update_expense_without_fields_or_row(db):
+    """An empty update raises, and a missing ID reports False."""
+    expense_id = db.add_expense("2024-01-15", "Food", "Lunch", 12.5)
+    
+    with pytest.raises(ValueError):
+        db.update_expense(expense_id)
+    assert db.update_expense(expense_id + 1, amount=1.0) is False
@@ -0,0 +1,171 @@
+"""
+Tests for the scripted subcommands in main.py.
+
+Each test runs main() in its own temporary directory, so the default
+data/expenses.db is created there.
+"""
+
+import csv
+
+import pytest
+
+from database import EXPENSE_COLUMNS
+from main import main
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run every test from an empty temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def run(capsys, *argv):
+    """Run main() with the given arguments and return (exit code, stdout)."""
+    with pytest.raises(SystemExit) as exit_info:
+        main(list(argv))
+    return exit_info.value.code, capsys.readouterr().out
+
+
+def test_add_valid_amount(capsys):
+    """An add with a valid amount exits 0 and the expense is listed."""
+    code, out = run(capsys, "add", "Food", "Lunch", "12.50", "--date", "2024-01-15")
+    
+    assert code == 0
+    assert "Added expense 1: 2024-01-15 Food Lunch $12.50" in out
+    
+    code, out = run(capsys, "list")
+    assert code == 0
+    assert "Lunch" in out
+
+
+@pytest.mark.parametrize("amount, message", [
+    ("-3", "Error: Amount must be positive."),
+    ("0", "Error: Amount must be positive."),
+    ("1e400", "Error: Invalid amount. Please enter a valid number."),
+    ("nan", "Error: Invalid amount. Please enter a valid number."),
+    ("inf", "Error: Invalid amount. Please enter a valid number."),
+    ("9" * 400, "Error: Invalid amount. Please enter a valid number."),
+])
+def test_add_rejects_bad_amounts(capsys, amount, message):
+    """Negative, zero and non-finite amounts exit 1 without writing."""
+    code, out = run(capsys, "add", "Food", "Lunch", amount)
+    
+    assert code == 1
+    assert message in out
+    
+    code, out = run(capsys, "list")
+    assert "No expenses found." in out
+
+
+@pytest.mark.parametrize("category, description, message", [
+    ("", "Lunch", "Error: Category cannot be empty."),
+    ("Food", "   ", "Error: Description cannot be empty."),
+])
+def test_add_rejects_blank_text(capsys, category, description, message):
+    """Blank category or description fields exit 1 without writing, as in the menu."""
+    code, out = run(capsys, "add", category, description, "5")
+    
+    assert code == 1
+    assert message in out
+    
+    code, out = run(capsys, "list")
+    assert "No expenses found." in out
+
+
+def test_edit_rejects_blank_text(capsys):
+    """Editing a field to blank exits 1 and leaves the expense unchanged."""
+    run(capsys, "add", "Food", "Lunch", "12.50", "--date", "2024-01-15")
+    
+    code, out = run(capsys, "edit", "1", "--category", " ")
+    
+    assert code == 1
+    assert "Error: Category cannot be empty." in out
+    code, out = run(capsys, "list")
+    assert "Food" in out
+
+
+@pytest.mark.parametrize("limit", ["0", "-2", "x"])
+def test_list_rejects_bad_limit(capsys, limit):
+    """A limit that is not a positive integer is a usage error."""
+    with pytest.raises(SystemExit) as exit_info:
+        main(["list", "--limit", limit])
+    
+    assert exit_info.value.code == 2
+    assert "--limit" in capsys.readouterr().err
+
+
+def test_add_rejects_bad_date(capsys):
+    """An impossible date exits 1."""
+    code, out = run(capsys, "add", "Food", "Lunch", "5", "--date", "2024-02-30")
+    
+    assert code == 1
+    assert "Error: Date must be in YYYY-MM-DD format" in out
+
+
+def test_edit_missing_id(capsys):
+    """Editing an ID that does not exist exits 1."""
+    code, out = run(capsys, "edit", "99", "--amount", "5")
+    
+    assert code == 1
+    assert "Error: Expense with ID 99 not found." in out
+
+
+def test_edit_existing_expense(capsys):
+    """Editing an existing expense exits 0."""
+    run(capsys, "add", "Food", "Lunch", "12.50", "--date", "2024-01-15")
+    
+    code, out = run(capsys, "edit", "1", "--amount", "14", "--category", "Dining")
+    
+    assert code == 0
+    assert "Updated expense 1" in out
+
+
+def test_delete_missing_id(capsys):
+    """Deleting an ID that does not exist exits 1."""
+    code, out = run(capsys, "delete", "99")
+    
+    assert code == 1
+    assert "Error: Expense with ID 99 not found." in out
+
+
+def test_delete_reports_failure_if_any_id_is_missing(capsys):
+    """Found IDs are still deleted, but one missing ID makes the exit code 1."""
+    run(capsys, "add", "Food", "Lunch", "12.50")
+    
+    code, out = run(capsys, "delete", "1", "99")
+    
+    assert code == 1
+    assert "Deleted expense 1" in out
+    assert "Error: Expense with ID 99 not found." in out
+
+
+def test_export_output(capsys, workdir):
+    """export --output writes the header and every expense, newest date first."""
+    run(capsys, "add", "Food", "Lunch", "12.50", "--date", "2024-01-15")
+    run(capsys, "add", "Transportation", "Bus ticket", "3.20", "--date", "2024-01-16")
+    output = workdir / "out.csv"
+    
+    code, out = run(capsys, "export", "--output", str(output))
+    
+    assert code == 0
+    assert f"Expenses exported to: {output}" in out
+    with open(output, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(EXPENSE_COLUMNS)
+    assert [row[3] for row in rows[1:]] == ["Bus ticket", "Lunch"]
+
+
+def test_report_period_summary(capsys):
+    """report summary --period totals only that period; other kinds reject --period."""
+    run(capsys, "add", "Food", "Lunch", "12.50", "--date", "2024-03-05")
+    run(capsys, "add", "Food", "Dinner", "7.50", "--date", "2024-04-01")
+    
+    code, out = run(capsys, "report", "summary", "--period", "monthly", "--date", "2024-03-10")
+    
+    assert code == 0
+    assert "MONTHLY SUMMARY (2024-03-10)" in out
+    assert f"{'TOTAL':<20} $   12.50" in out
+    
+    code, out = run(capsys, "report", "stats", "--period", "monthly")
+    assert code == 1